@@ -1,77 +1,115 @@
 import numpy as np
 import logging
-from typing import List, Tuple
-from models import Card
+from operator import itemgetter
+from models import ACE_OF_HEARTS, HEART_BASE, is_heart
 
 log = logging.getLogger(__name__)
 
+# Extracts the card key from a legacy (player_idx, card_key) pile entry in C
+_GET_KEY = itemgetter(1)
+
 class AgentNaive:
     """
     This agent declares a number of tricks equal to the number of hearts in their hand.
     When playing, it tries to play the highest card lower than the highest card in the pile.
     If no such card exists, it plays its highest card.
     If first to play, it plays its lowest card.
+
+    Cards are packed uint8 keys (see models.card_key) stored in a fixed-size
+    NumPy buffer with a length counter, so the play logic runs as vectorized
+    reductions instead of interpreter loops.
     """
-    
+
     def __init__(self, cards: list, cfg):
         self.cfg = cfg
         self.name = "Naive"
-        self.cards = cards
+        self._hand = np.empty(cfg.game.max_cards_per_hand, dtype=np.uint8)
+        self.n_cards = 0
+        self.set_hand(cards)
         self.tricks = 0
         self.trick_history = []
-    
+
+    @property
+    def cards(self) -> np.ndarray:
+        """View of the current hand as packed uint8 keys."""
+        return self._hand[:self.n_cards]
+
+    @cards.setter
+    def cards(self, new_cards):
+        self.set_hand(new_cards)
+
+    def set_hand(self, cards):
+        """Load a freshly dealt hand into the preallocated buffer."""
+        n = len(cards)
+        self._hand[:n] = cards
+        self.n_cards = n
+        # Count hearts once per deal (vectorized); play() keeps it current
+        hand = self._hand[:n]
+        self._hearts_count = int(np.count_nonzero(
+            ((hand & 0xF0) == HEART_BASE) | (hand == ACE_OF_HEARTS)
+        ))
+
     def declare_tricks(self, total_declared: int, cards_per_round: int, is_last: bool) -> int:
         """
         Declare expected number of tricks based on hearts in hand.
-        
+
         Args:
             total_declared: Sum of declarations made by previous players
             cards_per_round: Number of cards per player this round
             is_last: Whether this player is the last to declare
-            
+
         Returns:
             int: Number of tricks declared
         """
-        # Count hearts in hand
-        hearts_count = sum(1 for card in self.cards if card.suit == '♥')
-        
+        # Hearts count is cached at deal time and maintained by play()
+        hearts_count = self._hearts_count
+        remaining = cards_per_round - total_declared
+
         if is_last:
-            # Last player must ensure total declarations != cards_per_round
-            remaining = cards_per_round - total_declared
-            if remaining <= 0:  # Safety check
-                return 0
-                
-            # Always pick a number different from remaining
-            if hearts_count >= remaining:
-                # If we have enough hearts, declare one less than remaining
-                return remaining - 1
-            else:
-                # If we have fewer hearts than remaining, declare them all
-                # unless that would make total = cards_per_round
-                if hearts_count == remaining:
-                    return hearts_count - 1
-                return hearts_count
-        else:
-            # Other players declare based on hearts, bounded by available tricks
-            max_declare = min(cards_per_round, cards_per_round - total_declared)
-            return min(hearts_count, max_declare)
-    
-    def play(self, card_pile: List[Tuple[int, 'Card']]) -> 'Card':
-        """Play a card based on the current pile state."""
-        if not card_pile:  # First to play
-            chosen_card = min(self.cards)
+            # Last player must ensure total declarations != cards_per_round,
+            # so the declaration is capped one below the remaining tricks
+            return max(0, min(hearts_count, remaining - 1))
+
+        # Other players declare their hearts, bounded by available tricks
+        return max(0, min(hearts_count, remaining))
+
+    def play(self, card_pile) -> int:
+        """Play a card based on the current pile state.
+
+        Args:
+            card_pile: uint8 array of the card keys played so far this
+                trick; a list of (player_idx, card_key) pairs is also
+                accepted for backwards compatibility
+
+        Returns:
+            int: The packed key of the chosen card
+        """
+        hand = self._hand[:self.n_cards]
+
+        if len(card_pile) == 0:  # First to play
+            idx = int(hand.argmin())
         else:
             # Find highest card in pile
-            highest_pile_card = max(card[1] for card in card_pile)
-            
-            # Find cards in hand lower than highest pile card
-            playable_cards = [card for card in self.cards if card < highest_pile_card]
-            
-            if playable_cards:  # If we have cards lower than highest
-                chosen_card = max(playable_cards)
+            if isinstance(card_pile, np.ndarray):
+                highest_pile_card = int(card_pile.max())
+            else:  # legacy (player, key) tuple pile
+                highest_pile_card = max(card_pile, key=_GET_KEY)[1]
+
+            # Find cards in hand lower than highest pile card; integer
+            # gather via flatnonzero beats boolean subscripting for these
+            # small selections
+            mask = hand < highest_pile_card
+
+            if mask.any():  # If we have cards lower than highest
+                playable_idx = np.flatnonzero(mask)
+                idx = int(playable_idx[hand[playable_idx].argmax()])
             else:  # If we must play higher
-                chosen_card = max(self.cards)
-        
-        # Remove and return the chosen card
-        self.cards.remove(chosen_card)
-        return chosen_card
\ No newline at end of file
+                idx = int(hand.argmax())
+
+        # Remove the chosen card with a swap-pop (hand order is irrelevant)
+        chosen_card = int(hand[idx])
+        self._hand[idx] = self._hand[self.n_cards - 1]
+        self.n_cards -= 1
+        if is_heart(chosen_card):
+            self._hearts_count -= 1
+        return chosen_card
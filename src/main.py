@@ -5,7 +5,9 @@ import hydra
 from hydra.core.hydra_config import HydraConfig
 from omegaconf import DictConfig
 
+import numba_kernels
 from mascarpone import Mascarpone
+from simulate import simulate
 
 log = logging.getLogger(__name__)
 
@@ -28,10 +30,15 @@ def setup_environment(cfg: DictConfig):
 def main(cfg: DictConfig):
     """Main function to run the game analysis and visualization."""
     setup_environment(cfg)
-
-    # Run game
-    game = Mascarpone(cfg)
-    game.play_game()
+    numba_kernels.warmup()
+
+    if cfg.get("n_trials", 1) > 1:
+        # Batch Monte-Carlo mode: many games on compiled kernels
+        simulate(cfg)
+    else:
+        # Run a single, fully logged game
+        game = Mascarpone(cfg)
+        game.play_game()
 
     # Return working directory for multirun
     return HydraConfig.get().run.dir
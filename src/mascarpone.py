@@ -1,11 +1,12 @@
 import logging
 import sys
-from typing import List, Tuple
+from typing import List
 
 import numpy as np
 
 from agents import AgentNaive
-from models import Card
+from models import Suit, card_key, card_str
+from numba_kernels import trick_winner_u8
 
 # Configure logging to handle Unicode and write to both console and file
 logging.basicConfig(
@@ -20,21 +21,13 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-def trick_winner(pile: List[Tuple[int, Card]]) -> int:
-    """Determine the winner of a trick."""
-    highest_card_idx = 0
-    for i in range(1, len(pile)):
-        if pile[i][1] > pile[highest_card_idx][1]:
-            highest_card_idx = i
-    return highest_card_idx
-
-
 class Mascarpone:
     def __init__(self, cfg):
         self.cfg = cfg
-        self.n_players = cfg.game.N_players
-        self.n_cards = cfg.game.N_cards
-        self.initial_hand = cfg.game.Initial_hand
+        self._freeze_config()
+        self.n_players = self._n_players
+        self.n_cards = self._n_cards
+        self.initial_hand = self._initial_hand
 
         # Game state
         self.current_round = 1
@@ -47,13 +40,44 @@ class Mascarpone:
         # Validate configuration
         self._validate_config()
 
-        # Initialize deck and agents
+        # PCG64 generator: faster than the legacy np.random singleton,
+        # lock-free, and reproducible when cfg.seed is set
+        self._rng = np.random.default_rng(cfg.get('seed', None))
+
+        # Initialize deck and agents; the deck composition never changes,
+        # so build the keys once and reshuffle the same array in place
         self.deck = self._create_deck()
+        self._rng.shuffle(self.deck)
         self.agents = self._initialize_agents()
 
+        # Reusable pile buffers (structure-of-arrays): one slot per player,
+        # refilled every trick so no tuples or lists are allocated
+        self._pile_keys = np.empty(self._max_players, dtype=np.uint8)
+        self._pile_players = np.empty(self._max_players, dtype=np.int8)
+
         # Setup logging
         self._setup_logging()
 
+    def _freeze_config(self):
+        """Cache config values as plain attributes.
+
+        OmegaConf attribute access resolves interpolations on every read,
+        so the hot methods read these plain ints/tuples instead.
+        """
+        game = self.cfg.game
+        self._n_players = int(game.N_players)
+        self._n_cards = int(game.N_cards)
+        self._initial_hand = int(game.Initial_hand)
+        self._min_players = int(game.min_players)
+        self._max_players = int(game.max_players)
+        self._min_hand = int(game.min_cards_per_hand)
+        self._max_hand = int(game.max_cards_per_hand)
+        self._card_min_value = int(game.card_min_value)
+        self._card_max_value = int(game.card_max_value)
+        # Translate the config's unicode suit symbols to Suit members once
+        self._suits = tuple(Suit.from_symbol(s) if isinstance(s, str) else Suit(s)
+                            for s in game.suits)
+
     def _validate_config(self):
         """Validate game configuration parameters."""
         if self.n_players * self.initial_hand > self.n_cards:
@@ -61,26 +85,26 @@ class Mascarpone:
                 f"Not enough cards for {self.n_players} players "
                 f"with {self.initial_hand} cards each"
             )
-        if not (self.cfg.game.min_players <= self.n_players <= self.cfg.game.max_players):
+        if not (self._min_players <= self.n_players <= self._max_players):
             raise ValueError(
                 f"Number of players must be between "
-                f"{self.cfg.game.min_players} and {self.cfg.game.max_players}"
+                f"{self._min_players} and {self._max_players}"
             )
-        if self.initial_hand < self.cfg.game.min_cards_per_hand:
+        if self.initial_hand < self._min_hand:
             raise ValueError(
                 f"Initial hand size ({self.initial_hand}) cannot be less than "
-                f"minimum cards per hand ({self.cfg.game.min_cards_per_hand})"
+                f"minimum cards per hand ({self._min_hand})"
             )
 
-    def _create_deck(self) -> List[Card]:
-        """Create and shuffle a new deck of cards."""
-        deck = []
-        for suit in self.cfg.game.suits:
-            for value in range(self.cfg.game.card_min_value,
-                               self.cfg.game.card_max_value + 1):
-                deck.append(Card(suit, value))
-        np.random.shuffle(deck)
-        return deck
+    def _create_deck(self) -> np.ndarray:
+        """Build the immutable uint8 template of packed card keys."""
+        return np.fromiter(
+            (card_key(suit, value)
+             for suit in self._suits
+             for value in range(self._card_min_value,
+                                self._card_max_value + 1)),
+            dtype=np.uint8
+        )
 
     def _initialize_agents(self) -> List[AgentNaive]:
         """Initialize agents with their initial hands."""
@@ -95,13 +119,15 @@ class Mascarpone:
     def _setup_logging(self):
         """Set up initial game logging."""
         log.info("=== Game Settings ===")
-        log.info(f"Number of players: {self.n_players}")
-        log.info(f"Initial hand size: {self.initial_hand}")
-        log.info(f"Total cards: {self.n_cards}")
-        log.info(f"Descending rounds: {self.descending_rounds}")
+        log.info("Number of players: %d", self.n_players)
+        log.info("Initial hand size: %d", self.initial_hand)
+        log.info("Total cards: %d", self.n_cards)
+        log.info("Descending rounds: %d", self.descending_rounds)
         log.info("\n=== Initial Hands ===")
-        for i, agent in enumerate(self.agents):
-            log.info(f"Agent {i} initial hand: {[str(card) for card in agent.cards]}")
+        if log.isEnabledFor(logging.INFO):
+            for i, agent in enumerate(self.agents):
+                log.info("Agent %d initial hand: %s",
+                         i, [card_str(card) for card in agent.cards])
         log.info("==================\n")
 
     def _update_cards_per_round(self):
@@ -109,53 +135,60 @@ class Mascarpone:
         if self.current_round <= self.descending_rounds:
             # Descending phase
             self.cards_per_round = max(
-                self.cfg.game.min_cards_per_hand,
+                self._min_hand,
                 self.initial_hand - self.current_round + 1
             )
         else:
             # Ascending phase
             cards_to_add = self.current_round - self.descending_rounds
             self.cards_per_round = min(
-                self.cfg.game.max_cards_per_hand,
-                self.cfg.game.min_cards_per_hand + cards_to_add - 1
+                self._max_hand,
+                self._min_hand + cards_to_add - 1
             )
 
     def _collect_declarations(self) -> List[int]:
         """Collect trick declarations from all active players."""
-        declarations = []
+        n_active = len(self.active_players)
+        declarations = [0] * n_active
         total_declared = 0
 
         for i, player_idx in enumerate(self.active_players):
             # Get declaration from agent
-            is_last = i == len(self.active_players) - 1
+            is_last = i == n_active - 1
             declaration = self.agents[player_idx].declare_tricks(
                 total_declared,
                 self.cards_per_round,
                 is_last
             )
 
-            declarations.append(declaration)
+            declarations[i] = declaration
             total_declared += declaration
 
             # Log the declaration along with current hand
-            hand_str = [str(card) for card in self.agents[player_idx].cards]
-            log.info(f"Agent {player_idx} {hand_str}: declares {declaration}")
+            if log.isEnabledFor(logging.INFO):
+                hand_str = [card_str(card) for card in self.agents[player_idx].cards]
+                log.info("Agent %d %s: declares %d", player_idx, hand_str, declaration)
 
         return declarations
 
     def _deal_cards(self):
         """Deal cards to players for the current round."""
-        self.deck = self._create_deck()  # Reshuffle deck
+        if len(self.active_players) < 2:  # Game already decided
+            return
+        self._rng.shuffle(self.deck)  # In-place reshuffle, no allocation
         for i, player_idx in enumerate(self.active_players):
             start_idx = i * self.cards_per_round
             end_idx = start_idx + self.cards_per_round
-            self.agents[player_idx].cards = self.deck[start_idx:end_idx]
-            log.info(f"Agent {player_idx} hand: {[str(card) for card in self.agents[player_idx].cards]}")
+            # set_hand copies the slice into the agent's preallocated buffer
+            self.agents[player_idx].set_hand(self.deck[start_idx:end_idx])
+            if log.isEnabledFor(logging.INFO):
+                log.info("Agent %d hand: %s", player_idx,
+                         [card_str(card) for card in self.agents[player_idx].cards])
 
-    def _play_round(self):
-        """Play a complete round of the game."""
-        log.info(f"\n=== Round {self.current_round} ===")
-        log.info(f"Cards per hand: {self.cards_per_round}")
+    def _play_round(self) -> bool:
+        """Play a complete round; returns True once the game is decided."""
+        log.info("\n=== Round %d ===", self.current_round)
+        log.info("Cards per hand: %d", self.cards_per_round)
 
         # Deal cards
         self._deal_cards()
@@ -165,50 +198,59 @@ class Mascarpone:
         declarations = self._collect_declarations()
 
         # Play tricks
+        pile_keys = self._pile_keys
+        pile_players = self._pile_players
+        n_active = len(self.active_players)
         for trick_num in range(self.cards_per_round):
-            log.info(f"\n--- Trick {trick_num + 1}/{self.cards_per_round} ---")
-            pile = []
+            log.info("\n--- Trick %d/%d ---", trick_num + 1, self.cards_per_round)
 
-            # Each player plays a card
-            for player_idx in self.active_players:
-                card = self.agents[player_idx].play(pile)
-                pile.append((player_idx, card))
-                log.info(f"Agent {player_idx} plays: {str(card)}")
+            # Each player plays a card; agents see the keys played so far
+            for slot, player_idx in enumerate(self.active_players):
+                card = self.agents[player_idx].play(pile_keys[:slot])
+                pile_keys[slot] = card
+                pile_players[slot] = player_idx
+                if log.isEnabledFor(logging.INFO):
+                    log.info("Agent %d plays: %s", player_idx, card_str(card))
 
             # Determine winner
-            winner_idx = trick_winner(pile)
-            winner_player = pile[winner_idx][0]
+            winner_idx = int(trick_winner_u8(pile_keys[:n_active]))
+            winner_player = int(pile_players[winner_idx])
             self.agents[winner_player].tricks += 1
 
-            log.info(f"Pile: {[(p, str(c)) for p, c in pile]}")
-            log.info(f"Winning card: {str(pile[winner_idx][1])}")
-            log.info(f"Winner: Agent {winner_player}")
+            if log.isEnabledFor(logging.INFO):
+                log.info("Pile: %s", [(int(p), card_str(c)) for p, c in
+                                      zip(pile_players[:n_active],
+                                          pile_keys[:n_active])])
+                log.info("Winning card: %s", card_str(pile_keys[winner_idx]))
+                log.info("Winner: Agent %d", winner_player)
 
         # Check eliminations
         log.info("\n--- Round Results ---")
-        self._check_eliminations(declarations)
+        return self._check_eliminations(declarations)
 
-    def _check_eliminations(self, declarations: List[int]):
-        """Check which players are eliminated this round."""
+    def _check_eliminations(self, declarations: List[int]) -> bool:
+        """Check eliminations for the round; returns True if game is decided."""
         log.info("Comparing tricks won vs declared:")
-        eliminated = []
+        eliminated = set()
 
         for i, player_idx in enumerate(self.active_players):
             agent = self.agents[player_idx]
-            log.info(f"Agent {player_idx}: [{agent.tricks} vs {declarations[i]}]")
+            log.info("Agent %d: [%d vs %d]", player_idx, agent.tricks, declarations[i])
 
             if agent.tricks != declarations[i]:
-                eliminated.append(player_idx)
-                log.info(f"Agent {player_idx} does MASCARPONE!")
+                eliminated.add(player_idx)
+                log.info("Agent %d does MASCARPONE!", player_idx)
 
             # Reset tricks for next round
             agent.tricks = 0
 
-        # Remove eliminated players
-        for player_idx in eliminated:
-            self.active_players.remove(player_idx)
+        # Remove eliminated players in a single pass
+        if eliminated:
+            self.active_players = [p for p in self.active_players
+                                   if p not in eliminated]
 
-        log.info(f"Remaining Players: {self.active_players}")
+        log.info("Remaining Players: %s", self.active_players)
+        return len(self.active_players) <= 1
 
     def play_game(self):
         """Play the complete game until a winner is determined."""
@@ -216,18 +258,20 @@ class Mascarpone:
             # Check if we have enough cards for this round
             if len(self.active_players) * self.cards_per_round > self.n_cards:
                 log.warning(
-                    f"Not enough cards for {len(self.active_players)} players "
-                    f"with {self.cards_per_round} cards each. "
-                    "Reducing cards per round."
+                    "Not enough cards for %d players with %d cards each. "
+                    "Reducing cards per round.",
+                    len(self.active_players), self.cards_per_round
                 )
                 self.cards_per_round -= 1
                 continue
 
-            self._play_round()
+            if self._play_round():
+                break  # Winner decided; skip the next-round bookkeeping
+
             self._update_cards_per_round()
             self.current_round += 1
 
         if self.active_players:
-            log.info(f"\n Winner: Agent {self.active_players[0]}")
+            log.info("\n Winner: Agent %d", self.active_players[0])
         else:
             log.info("\nGame ended with no winners!")
@@ -1,44 +1,129 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
 
 
-@dataclass
+class Suit(IntEnum):
+    """Suits ranked per game rules; comparing members compares strength."""
+    SPADES = 1
+    CLUBS = 2
+    DIAMONDS = 3
+    HEARTS = 4
+
+    @classmethod
+    def from_symbol(cls, symbol: str) -> 'Suit':
+        """Translate a unicode suit symbol (e.g. '♥') to its enum member."""
+        return _SUIT_FROM_SYMBOL[symbol]
+
+
+_SUIT_FROM_SYMBOL = {'♥': Suit.HEARTS, '♦': Suit.DIAMONDS,
+                     '♣': Suit.CLUBS, '♠': Suit.SPADES}
+
+# Suit values by symbol, kept for call sites that still deal in symbols
+SUIT_VALUES = {'♥': 4, '♦': 3, '♣': 2, '♠': 1}
+
+# Value mappings for face cards
+VALUE_MAPPING = {
+    1: 'A',
+    11: 'J',
+    12: 'Q',
+    13: 'K'
+}
+
+# Use ASCII representations for suits to avoid encoding issues
+ASCII_SUITS = {'♥': 'H', '♦': 'D', '♣': 'C', '♠': 'S'}
+
+# Packed uint8 card keys for the simulation hot path.
+# The suit rank occupies the high nibble and the value the low nibble, so a
+# plain integer comparison orders cards exactly like the game rules: suits
+# first (hearts > diamonds > clubs > spades), then value. The Ace of Hearts
+# beats everything, so its key is pinned to 0xFF.
+HEART_BASE = Suit.HEARTS << 4
+ACE_OF_HEARTS = 0xFF
+
+
+def card_key(suit, value: int) -> int:
+    """Pack a (suit, value) pair into a single uint8 comparison key.
+
+    ``suit`` may be a Suit member or one of the unicode suit symbols.
+    """
+    if not isinstance(suit, int):
+        suit = _SUIT_FROM_SYMBOL[suit]
+    if suit == Suit.HEARTS and value == 1:
+        return ACE_OF_HEARTS
+    return (suit << 4) | value
+
+
+def is_heart(key: int) -> bool:
+    """Check whether a packed card key is a heart."""
+    return key == ACE_OF_HEARTS or (key & 0xF0) == HEART_BASE
+
+
+# Precomputed strings for every valid card key, so logging a card is a single
+# list subscript instead of dict lookups and f-string interpolation.
+_CARD_STR = ['?'] * 256
+for _symbol, _suit in _SUIT_FROM_SYMBOL.items():
+    for _value in range(1, 14):
+        _value_str = VALUE_MAPPING.get(_value, str(_value))
+        _CARD_STR[card_key(_suit, _value)] = f"{_value_str}{ASCII_SUITS[_symbol]}"
+
+
+def card_str(key: int) -> str:
+    """Human-readable representation of a packed card key (e.g. 'AH', '10S')."""
+    return _CARD_STR[key]
+
+
+@dataclass(slots=True, eq=False)
 class Card:
-    suit: str
+    """Object representation of a card, used by the web game.
+
+    The simulation works on packed integer keys (see ``card_key``) instead.
+    The key is also precomputed here once per instance, so comparisons are
+    single integer compares rather than suit dict lookups and
+    Ace-of-Hearts branches per call.
+    """
+    suit: Suit
     value: int
+    key: int = field(init=False, repr=False)
+    s: str = field(init=False, repr=False)
+    suit_value: int = field(init=False, repr=False)
+    # Web-game trick strengths (aces high): suit rank * 100 + value, with
+    # the Ace of Hearts above everything normally and below everything
+    # when its holder plays it low
+    normal_strength: int = field(init=False, repr=False)
+    ace_low_strength: int = field(init=False, repr=False)
 
-    # Suit values according to game rules
-    SUIT_VALUES = {'♥': 4, '♦': 3, '♣': 2, '♠': 1}
+    # Kept as class attributes for backwards compatibility
+    SUIT_VALUES = SUIT_VALUES
+    VALUE_MAPPING = VALUE_MAPPING
 
-    # Value mappings for face cards
-    VALUE_MAPPING = {
-        1: 'A',
-        11: 'J',
-        12: 'Q',
-        13: 'K'
-    }
+    def __post_init__(self):
+        # Accept unicode symbols so existing constructors keep working
+        if not isinstance(self.suit, Suit):
+            self.suit = Suit.from_symbol(self.suit)
+        self.key = card_key(self.suit, self.value)
+        # Cards are immutable in practice, so cache the display string and
+        # suit rank too; comparisons then never touch the SUIT_VALUES dict
+        self.s = _CARD_STR[self.key]
+        self.suit_value = int(self.suit)
+        if self.key == ACE_OF_HEARTS:
+            self.normal_strength = 5 * 100 + 14
+            self.ace_low_strength = 0
+        else:
+            high_value = 14 if self.value == 1 else self.value
+            self.normal_strength = self.suit * 100 + high_value
+            self.ace_low_strength = self.normal_strength
 
     def __str__(self) -> str:
-        # Use ASCII representations for suits to avoid encoding issues
-        ASCII_SUITS = {'♥': 'H', '♦': 'D', '♣': 'C', '♠': 'S'}
-        value_str = self.VALUE_MAPPING.get(self.value, str(self.value))
-        return f"{value_str}{ASCII_SUITS[self.suit]}"
+        return self.s
 
     def __lt__(self, other: 'Card') -> bool:
-        # Special case for Ace of Hearts
-        if self.suit == '♥' and self.value == 1:
-            return False  # Ace of Hearts is never less than another card
-        if other.suit == '♥' and other.value == 1:
-            return True  # All cards are less than Ace of Hearts
-
-        # Compare suits first
-        if self.suit != other.suit:
-            return self.SUIT_VALUES[self.suit] < self.SUIT_VALUES[other.suit]
-
-        # Then compare values
-        return self.value < other.value
+        return self.key < other.key
 
     def __gt__(self, other: 'Card') -> bool:
-        return other < self
+        return self.key > other.key
 
     def __eq__(self, other: 'Card') -> bool:
-        return self.suit == other.suit and self.value == other.value
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        return self.key
@@ -0,0 +1,42 @@
+"""
+Shared Numba-compiled kernels for the game hot path.
+
+Each kernel carries an explicit signature and cache=True, so the compiled
+code is persisted under __pycache__ and reloaded on later runs instead of
+being recompiled. warmup() exercises every kernel once on dummy inputs so
+any remaining compile or cache-load cost is paid at startup rather than
+mid-game. Without numba the kernels run as plain Python.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit('int64(uint8[:])', cache=True)
+def trick_winner_u8(pile_keys):
+    """Index of the highest card key in the pile."""
+    best = 0
+    v = pile_keys[0]
+    for i in range(1, pile_keys.shape[0]):
+        if pile_keys[i] > v:
+            v = pile_keys[i]
+            best = i
+    return best
+
+
+def warmup():
+    """Run every kernel once on tiny dummy inputs to absorb compile cost.
+
+    The batch-simulation kernels in simulate.py compile (and cache) on
+    their first trial run instead, since single-game mode never needs them.
+    """
+    trick_winner_u8(np.zeros(7, dtype=np.uint8))
@@ -0,0 +1,47 @@
+"""
+Numba-compiled trick resolution for bulk web-game simulation.
+
+Live rooms resolve tricks with a plain Python max() over precomputed
+card strengths, which is already cheap for a single table. When many
+games are simulated in-process (tournaments, AI self-play), WebGame can
+be switched to this kernel instead, which runs the argmax over raw int
+arrays. Without numba the kernel runs as plain Python.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit('int64(int16[:], int16[:], uint16)', cache=True)
+def resolve_trick(normal_strengths, ace_low_strengths, ace_low_mask):
+    """Index of the winning card in a trick.
+
+    Takes the per-card normal and ace-low strengths plus a bitmask whose
+    bit i is set when the i-th card was played ace-low.
+    """
+    best = 0
+    best_strength = -1
+    for i in range(normal_strengths.shape[0]):
+        if (ace_low_mask >> i) & 1:
+            strength = ace_low_strengths[i]
+        else:
+            strength = normal_strengths[i]
+        if strength > best_strength:
+            best_strength = strength
+            best = i
+    return best
+
+
+def warmup():
+    """Run the kernel once on dummy inputs to absorb compile cost."""
+    zeros = np.zeros(7, dtype=np.int16)
+    resolve_trick(zeros, zeros, 0)
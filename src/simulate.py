@@ -0,0 +1,212 @@
+"""
+Batch Monte-Carlo simulation of Mascarpone games.
+
+Ports the single-game logic (AgentNaive + Mascarpone round loop) to
+Numba-compiled kernels operating on packed uint8 card keys, and runs many
+independent games in parallel with prange. Used by main.py when
+cfg.n_trials > 1. Without numba the kernels run as plain Python, slower
+but with identical results.
+"""
+import logging
+
+import numpy as np
+
+# Module-level ints are compile-time constants to numba, so the kernels
+# can use the shared definitions directly
+from models import ACE_OF_HEARTS, HEART_BASE, card_key
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; kernels run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+log = logging.getLogger(__name__)
+
+
+@njit(cache=True)
+def _count_hearts(hand, n):
+    """Number of hearts among the first n keys of a hand."""
+    count = 0
+    for i in range(n):
+        k = hand[i]
+        if k == ACE_OF_HEARTS or (k & 0xF0) == HEART_BASE:
+            count += 1
+    return count
+
+
+@njit(cache=True)
+def _declare_tricks(hearts_count, total_declared, cards_per_round, is_last):
+    """Mirror of AgentNaive.declare_tricks on scalar ints."""
+    remaining = cards_per_round - total_declared
+    if is_last:
+        return max(0, min(hearts_count, remaining - 1))
+    return max(0, min(hearts_count, remaining))
+
+
+@njit(cache=True)
+def _play(hand, n, pile_max, first):
+    """Mirror of AgentNaive.play on a uint8 hand of length n.
+
+    Picks the highest card below pile_max (or the lowest card when first
+    to play, or the highest overall when none is playable), removes it
+    with a swap-pop and returns its key. The caller decrements n.
+    """
+    if first:
+        idx = 0
+        for i in range(1, n):
+            if hand[i] < hand[idx]:
+                idx = i
+    else:
+        idx = -1
+        for i in range(n):
+            if hand[i] < pile_max and (idx < 0 or hand[i] > hand[idx]):
+                idx = i
+        if idx < 0:  # must play higher
+            idx = 0
+            for i in range(1, n):
+                if hand[i] > hand[idx]:
+                    idx = i
+    chosen = hand[idx]
+    hand[idx] = hand[n - 1]
+    return chosen
+
+
+@njit(cache=True)
+def _play_single_game(deck, n_players, initial_hand, descending_rounds,
+                      min_hand, max_hand):
+    """Play one full game; returns the winner index or -1 for no winner."""
+    n_cards = deck.shape[0]
+
+    hands = np.empty((n_players, max_hand), dtype=np.uint8)
+    hand_n = np.zeros(n_players, dtype=np.int64)
+    tricks = np.zeros(n_players, dtype=np.int64)
+    declarations = np.zeros(n_players, dtype=np.int64)
+    active = np.empty(n_players, dtype=np.int64)
+    for i in range(n_players):
+        active[i] = i
+
+    n_active = n_players
+    cards_per_round = initial_hand
+    current_round = 1
+
+    while n_active > 1:
+        if n_active * cards_per_round > n_cards:
+            cards_per_round -= 1
+            continue
+
+        # Deal
+        np.random.shuffle(deck)
+        for i in range(n_active):
+            p = active[i]
+            start = i * cards_per_round
+            for j in range(cards_per_round):
+                hands[p, j] = deck[start + j]
+            hand_n[p] = cards_per_round
+            tricks[p] = 0
+
+        # Declarations
+        total_declared = 0
+        for i in range(n_active):
+            p = active[i]
+            hearts = _count_hearts(hands[p], cards_per_round)
+            d = _declare_tricks(hearts, total_declared, cards_per_round,
+                                i == n_active - 1)
+            declarations[i] = d
+            total_declared += d
+
+        # Tricks
+        for _ in range(cards_per_round):
+            best = 0
+            winner_p = active[0]
+            for i in range(n_active):
+                p = active[i]
+                k = _play(hands[p], hand_n[p], best, i == 0)
+                hand_n[p] -= 1
+                if i == 0 or k > best:
+                    best = k
+                    winner_p = p
+            tricks[winner_p] += 1
+
+        # Eliminations (compact the active array in one pass)
+        keep = 0
+        for i in range(n_active):
+            p = active[i]
+            if tricks[p] == declarations[i]:
+                active[keep] = p
+                keep += 1
+        n_active = keep
+
+        # Next round's hand size
+        if current_round <= descending_rounds:
+            cards_per_round = max(min_hand, initial_hand - current_round + 1)
+        else:
+            cards_to_add = current_round - descending_rounds
+            cards_per_round = min(max_hand, min_hand + cards_to_add - 1)
+        current_round += 1
+
+    if n_active == 1:
+        return active[0]
+    return -1
+
+
+@njit(parallel=True, cache=True)
+def run_trials(n_trials, deck_template, n_players, initial_hand,
+               descending_rounds, min_hand, max_hand, seed):
+    """Run n_trials independent games across cores; returns winner per trial.
+
+    Each trial writes only its own slot of the winners array, so the
+    prange loop is safe to parallelize. With seed >= 0, trial t seeds its
+    thread-local RNG with seed + t for reproducibility.
+    """
+    winners = np.empty(n_trials, dtype=np.int64)
+    for t in prange(n_trials):
+        if seed >= 0:
+            np.random.seed(seed + t)
+        deck = deck_template.copy()
+        winners[t] = _play_single_game(deck, n_players, initial_hand,
+                                       descending_rounds, min_hand, max_hand)
+    return winners
+
+
+def simulate(cfg) -> np.ndarray:
+    """Run cfg.n_trials games and log the winner distribution."""
+    deck_template = np.fromiter(
+        (card_key(suit, value)
+         for suit in cfg.game.suits
+         for value in range(cfg.game.card_min_value,
+                            cfg.game.card_max_value + 1)),
+        dtype=np.uint8
+    )
+
+    n_trials = int(cfg.n_trials)
+    n_players = int(cfg.game.N_players)
+    initial_hand = int(cfg.game.Initial_hand)
+    descending_rounds = int(cfg.get('descending_rounds', initial_hand - 2))
+    seed = cfg.get('seed', None)
+    seed = -1 if seed is None else int(seed)
+
+    log.info("Running %d simulated games with %d players", n_trials, n_players)
+    winners = run_trials(n_trials, deck_template, n_players, initial_hand,
+                         descending_rounds,
+                         int(cfg.game.min_cards_per_hand),
+                         int(cfg.game.max_cards_per_hand),
+                         seed)
+
+    counts = np.bincount(winners[winners >= 0], minlength=n_players)
+    for player, wins in enumerate(counts):
+        log.info("Agent %d wins: %d (%.1f%%)",
+                 player, wins, 100.0 * wins / n_trials)
+    no_winner = int(np.count_nonzero(winners < 0))
+    if no_winner:
+        log.info("Games with no winner: %d (%.1f%%)",
+                 no_winner, 100.0 * no_winner / n_trials)
+
+    return winners
@@ -1,14 +1,24 @@
 """
 Web-based Mascarpone game logic for online multiplayer.
 """
-import uuid
 import random
+import secrets
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
-from models import Card
 
+import numpy as np
 
-@dataclass
+import sim_core
+from models import Card, Suit
+
+# Built once at import: cards are immutable, so every deal can share these
+# instances and just shuffle a fresh list of references.
+_DECK_TEMPLATE = tuple(Card(suit, value)
+                       for suit in Suit
+                       for value in range(1, 14))  # 1 (Ace) to 13 (King)
+
+
+@dataclass(slots=True)
 class Player:
     """Represents a human player in the web game."""
     id: str
@@ -25,10 +35,12 @@ class WebGame:
     """
     # Card distribution pattern: descending then ascending
     CARD_PATTERN = [5, 4, 3, 2, 3, 4, 5, 6, 7]
-    
-    # Suit values for comparison
-    SUIT_VALUES = {'♥': 4, '♦': 3, '♣': 2, '♠': 1}
-    
+
+    # When driving many headless games (tournaments, self-play), flip this
+    # to resolve tricks through the sim_core kernel; live rooms keep the
+    # plain Python path, which wins for a single table
+    simulation_mode = False
+
     def __init__(self, room_id: str, min_players: int = 2, max_players: int = 10):
         self.room_id = room_id
         self.min_players = min_players
@@ -36,8 +48,22 @@ class WebGame:
         
         # Game state
         self.players: Dict[str, Player] = {}
-        self.player_order: List[str] = []
+        # Insertion-ordered ids; a dict gives O(1) removal on disconnect
+        self.player_order: Dict[str, None] = {}
+        # Public player summaries, mutated in place as the game state
+        # changes so broadcasts never rebuild the dicts
+        self._public_players: List[Dict] = []
+        self._public_by_id: Dict[str, Dict] = {}
         self.active_player_ids: List[str] = []
+        self._active_idx: Dict[str, int] = {}  # player id -> active index
+        # Players also get a stable index at join; who is still in the game
+        # is a bitmask over those indices, so "how many are left" is a
+        # bit_count() instead of list bookkeeping
+        self.player_index: Dict[str, int] = {}
+        self.active_mask = 0
+        # Players addressed by that index; broadcast loops walk this list
+        # instead of hashing long socket-id strings per player
+        self._players_arr: List[Optional[Player]] = []
         
         # Phase and round tracking
         self.phase = 'waiting'  # waiting, declaring, playing, round_end, game_over
@@ -46,11 +72,17 @@ class WebGame:
         
         # Declaration tracking
         self.declarations: Dict[str, int] = {}
+        self._declared_total = 0  # running sum, updated on each declaration
         self.current_declarer_idx = 0
+        self._declarations_view: Optional[Dict] = None  # broadcast cache
         
-        # Trick tracking
+        # Trick tracking; the pile is three parallel lists so trick
+        # resolution runs a tight max() over ints without tuple unpacking
         self.current_trick = 0
-        self.current_pile: List[Tuple[str, Card]] = []
+        self.pile_pids: List[str] = []
+        self.pile_cards: List[Card] = []
+        self.pile_ace_low: List[bool] = []
+        self._pile_view: List[Tuple[str, str]] = []  # (player id, card string)
         self.current_player_idx = 0
         self.trick_starter_idx = 0
         
@@ -66,8 +98,21 @@ class WebGame:
         if player_id in self.players:
             return False
         
-        self.players[player_id] = Player(id=player_id, name=name)
-        self.player_order.append(player_id)
+        player = Player(id=player_id, name=name)
+        self.players[player_id] = player
+        self.player_order[player_id] = None
+        self.player_index[player_id] = len(self._players_arr)
+        self._players_arr.append(player)
+        summary = {
+            'id': player_id,
+            'name': name,
+            'card_count': 0,
+            'tricks_won': 0,
+            'declared_tricks': None,
+            'is_eliminated': False
+        }
+        self._public_players.append(summary)
+        self._public_by_id[player_id] = summary
         return True
     
     def remove_player(self, player_id: str) -> bool:
@@ -76,9 +121,14 @@ class WebGame:
             return False
         
         del self.players[player_id]
-        self.player_order.remove(player_id)
-        if player_id in self.active_player_ids:
+        del self.player_order[player_id]
+        self._public_players.remove(self._public_by_id.pop(player_id))
+        index = self.player_index.pop(player_id)
+        self.active_mask &= ~(1 << index)
+        self._players_arr[index] = None  # keep later indices stable
+        if player_id in self._active_idx:
             self.active_player_ids.remove(player_id)
+            self._rebuild_active_idx()
         return True
     
     def start_game(self) -> bool:
@@ -88,18 +138,18 @@ class WebGame:
         if self.phase != 'waiting':
             return False
         
-        self.active_player_ids = self.player_order.copy()
+        self.active_player_ids = list(self.player_order)
+        for pid in self.active_player_ids:
+            self.active_mask |= 1 << self.player_index[pid]
+        self._rebuild_active_idx()
         self._start_round()
         return True
-    
-    def _create_deck(self) -> List[Card]:
-        """Create and shuffle a standard 52-card deck."""
-        deck = []
-        for suit in ['♥', '♦', '♣', '♠']:
-            for value in range(1, 14):  # 1 (Ace) to 13 (King)
-                deck.append(Card(suit, value))
-        random.shuffle(deck)
-        return deck
+
+    def _rebuild_active_idx(self):
+        """Refresh the id -> index map over active_player_ids."""
+        self._active_idx = {pid: i for i, pid in
+                            enumerate(self.active_player_ids)}
+        self._declarations_view = None  # keyed by active ids, so invalidate
     
     def _start_round(self):
         """Start a new round."""
@@ -111,8 +161,12 @@ class WebGame:
         while len(self.active_player_ids) * self.cards_per_round > 52:
             self.cards_per_round -= 1
         
-        # Deal cards
-        deck = self._create_deck()
+        # Deal cards: sample only as many as are actually dealt instead of
+        # shuffling the whole 52-card deck. Sampling indices keeps the RNG
+        # swapping small ints rather than Card references
+        needed = len(self.active_player_ids) * self.cards_per_round
+        idx = random.sample(range(len(_DECK_TEMPLATE)), needed)
+        deck = [_DECK_TEMPLATE[i] for i in idx]
         for i, player_id in enumerate(self.active_player_ids):
             player = self.players[player_id]
             start_idx = i * self.cards_per_round
@@ -120,12 +174,21 @@ class WebGame:
             player.cards = deck[start_idx:end_idx]
             player.tricks_won = 0
             player.declared_tricks = None
+            summary = self._public_by_id[player_id]
+            summary['card_count'] = self.cards_per_round
+            summary['tricks_won'] = 0
+            summary['declared_tricks'] = None
         
         # Reset round state
         self.declarations = {}
+        self._declared_total = 0
+        self._declarations_view = None
         self.current_declarer_idx = 0
         self.current_trick = 0
-        self.current_pile = []
+        self.pile_pids = []
+        self.pile_cards = []
+        self.pile_ace_low = []
+        self._pile_view = []
         self.trick_starter_idx = 0
         self.current_player_idx = 0
         
@@ -141,7 +204,7 @@ class WebGame:
     
     def get_total_declared(self) -> int:
         """Get the sum of all declarations so far."""
-        return sum(self.declarations.values())
+        return self._declared_total
     
     def is_last_declarer(self, player_id: str) -> bool:
         """Check if a player is the last to declare."""
@@ -174,7 +237,10 @@ class WebGame:
         
         # Record declaration
         self.declarations[player_id] = tricks
+        self._declared_total += tricks
+        self._declarations_view = None
         self.players[player_id].declared_tricks = tricks
+        self._public_by_id[player_id]['declared_tricks'] = tricks
         self.current_declarer_idx += 1
         
         # Check if all players have declared
@@ -207,69 +273,69 @@ class WebGame:
         if card_index < 0 or card_index >= len(player.cards):
             return {'success': False, 'error': 'Invalid card index'}
         
-        # Play the card
+        # Play the card; keep the broadcast view in sync so state fetches
+        # never re-stringify the pile
         card = player.cards.pop(card_index)
-        self.current_pile.append((player_id, card, ace_low))
-        
+        self.pile_pids.append(player_id)
+        self.pile_cards.append(card)
+        self.pile_ace_low.append(ace_low)
+        self._pile_view.append((player_id, card.s))
+        self._public_by_id[player_id]['card_count'] -= 1
+
         # Move to next player
         self.current_player_idx = (self.current_player_idx + 1) % len(self.active_player_ids)
-        
+
         # Check if trick is complete
-        if len(self.current_pile) == len(self.active_player_ids):
+        if len(self.pile_pids) == len(self.active_player_ids):
             return self._resolve_trick(card)
         
-        return {'success': True, 'card': str(card)}
-    
-    def _card_strength(self, card: Card, ace_low: bool = False) -> Tuple[int, int]:
-        """
-        Calculate card strength for comparison.
-        Returns (suit_value, card_value) tuple.
-        Ace of Hearts with ace_low=True is the weakest card.
-        """
-        suit_val = self.SUIT_VALUES[card.suit]
-        
-        # Ace of Hearts special handling
-        if card.suit == '♥' and card.value == 1:
-            if ace_low:
-                return (0, 0)  # Lowest possible
-            else:
-                return (5, 14)  # Highest possible
-        
-        # Ace is normally 14 (highest)
-        card_val = card.value if card.value != 1 else 14
-        return (suit_val, card_val)
+        return {'success': True, 'card': card.s}
     
     def _resolve_trick(self, last_card: Card) -> Dict:
         """Determine the winner of the current trick."""
-        # Find highest card
-        best_idx = 0
-        best_strength = self._card_strength(self.current_pile[0][1], self.current_pile[0][2])
-        
-        for i in range(1, len(self.current_pile)):
-            player_id, card, ace_low = self.current_pile[i]
-            strength = self._card_strength(card, ace_low)
-            if strength > best_strength:
-                best_strength = strength
-                best_idx = i
-        
-        winner_id = self.current_pile[best_idx][0]
+        # Find highest card; strengths are precomputed ints on each Card
+        cards = self.pile_cards
+        ace_low = self.pile_ace_low
+        if self.simulation_mode:
+            n = len(cards)
+            normal = np.empty(n, dtype=np.int16)
+            low = np.empty(n, dtype=np.int16)
+            mask = 0
+            for i, card in enumerate(cards):
+                normal[i] = card.normal_strength
+                low[i] = card.ace_low_strength
+                if ace_low[i]:
+                    mask |= 1 << i
+            best_idx = int(sim_core.resolve_trick(normal, low, mask))
+        else:
+            best_idx = max(
+                range(len(cards)),
+                key=lambda i: cards[i].ace_low_strength if ace_low[i]
+                else cards[i].normal_strength
+            )
+
+        winner_id = self.pile_pids[best_idx]
         self.players[winner_id].tricks_won += 1
+        self._public_by_id[winner_id]['tricks_won'] += 1
         
         result = {
             'success': True,
-            'card': str(last_card),
+            'card': last_card.s,
             'trick_complete': True,
             'winner': winner_id,
             'winner_name': self.players[winner_id].name,
-            'pile': [(pid, str(c)) for pid, c, _ in self.current_pile]
+            'pile': self._pile_view
         }
-        
+
         # Prepare for next trick
         self.current_trick += 1
-        self.current_pile = []
+        self.pile_pids = []
+        self.pile_cards = []
+        self.pile_ace_low = []
+        self._pile_view = []
         
-        # Set next trick starter to the winner
-        self.trick_starter_idx = self.active_player_ids.index(winner_id)
+        # Set next trick starter to the winner (O(1) map lookup)
+        self.trick_starter_idx = self._active_idx[winner_id]
         self.current_player_idx = self.trick_starter_idx
         
         # Check if round is complete
@@ -299,20 +365,26 @@ class WebGame:
             
             if declared != won:
                 player.is_eliminated = True
+                self._public_by_id[player_id]['is_eliminated'] = True
+                self.active_mask &= ~(1 << self.player_index[player_id])
                 eliminated.append(player_id)
-        
-        # Remove eliminated players
-        for pid in eliminated:
-            self.active_player_ids.remove(pid)
-        
+
+        # Derive the surviving ordering from the mask and refresh the map
+        if eliminated:
+            mask = self.active_mask
+            index = self.player_index
+            self.active_player_ids = [pid for pid in self.active_player_ids
+                                      if (mask >> index[pid]) & 1]
+            self._rebuild_active_idx()
+
         self.round_results.append(round_summary)
-        
+
         result['round_complete'] = True
         result['round_summary'] = round_summary
         result['eliminated'] = eliminated
-        
+
         # Check for game over
-        if len(self.active_player_ids) <= 1:
+        if self.active_mask.bit_count() <= 1:
             self.phase = 'game_over'
             result['game_over'] = True
             if self.active_player_ids:
@@ -332,51 +404,101 @@ class WebGame:
         self._start_round()
         return True
     
-    def get_player_state(self, player_id: str) -> Optional[Dict]:
-        """Get the game state from a specific player's perspective."""
-        if player_id not in self.players:
-            return None
-        
-        player = self.players[player_id]
-        
-        # Other players' info (hide cards)
-        other_players = []
-        for pid in self.player_order:
-            p = self.players[pid]
-            other_players.append({
-                'id': p.id,
-                'name': p.name,
-                'card_count': len(p.cards),
-                'tricks_won': p.tricks_won,
-                'declared_tricks': p.declared_tricks,
-                'is_eliminated': p.is_eliminated,
-                'is_you': pid == player_id
-            })
-        
+    def _get_declarations_view(self) -> Dict:
+        """Declarations keyed by active player, cached between state changes."""
+        if self._declarations_view is None:
+            self._declarations_view = {pid: self.declarations.get(pid)
+                                       for pid in self.active_player_ids}
+        return self._declarations_view
+
+    def get_public_state(self) -> Dict:
+        """Get the game state shared by every player (no hidden cards).
+
+        Built once per broadcast and merged with the per-player fields in
+        get_player_state, so the pile stringification, player summaries
+        and declarations dict are not rebuilt per recipient.
+        """
         state = {
             'room_id': self.room_id,
             'phase': self.phase,
             'current_round': self.current_round,
             'cards_per_round': self.cards_per_round,
-            'your_cards': [str(c) for c in player.cards],
+            'players': self._public_players,
+            'active_player_ids': self.active_player_ids,
+            'current_pile': self._pile_view,
+            'total_declared': self.get_total_declared(),
+            'declarations': self._get_declarations_view(),
+            # Always present (None outside their phase) so broadcast diffs
+            # are plain key assignments with no deletion semantics
+            'current_declarer': self.get_current_declarer_id(),
+            'current_player': self.get_current_player_id()
+        }
+
+        return state
+
+    def iter_private_states(self):
+        """Yield (player_id, private state) for every seated player.
+
+        Walks the int-indexed player array so a broadcast does no
+        per-player dict lookups keyed by socket-id strings.
+        """
+        for player in self._players_arr:
+            if player is not None:
+                yield player.id, self._private_state(player)
+
+    def get_private_state(self, player_id: str) -> Optional[Dict]:
+        """Get the per-recipient fields layered over the public state.
+
+        This is the small payload broadcast to each player's personal room;
+        every key is always present so the client can merge it blindly.
+        """
+        if player_id not in self.players:
+            return None
+        return self._private_state(self.players[player_id])
+
+    def _private_state(self, player: Player) -> Dict:
+        player_id = player.id
+        state = {
+            'your_id': player_id,
+            'your_cards': [c.s for c in player.cards],
             'your_tricks_won': player.tricks_won,
             'your_declared_tricks': player.declared_tricks,
             'is_eliminated': player.is_eliminated,
-            'players': other_players,
-            'active_player_ids': self.active_player_ids,
-            'current_pile': [(pid, str(c)) for pid, c, _ in self.current_pile],
-            'total_declared': self.get_total_declared(),
-            'declarations': {pid: self.declarations.get(pid) for pid in self.active_player_ids}
+            'is_your_turn': False,
+            'is_last_declarer': False
         }
-        
+
         if self.phase == 'declaring':
-            state['current_declarer'] = self.get_current_declarer_id()
-            state['is_your_turn'] = state['current_declarer'] == player_id
-            state['is_last_declarer'] = self.is_last_declarer(player_id) if state['is_your_turn'] else False
+            state['is_your_turn'] = self.get_current_declarer_id() == player_id
+            if state['is_your_turn']:
+                state['is_last_declarer'] = self.is_last_declarer(player_id)
         elif self.phase == 'playing':
-            state['current_player'] = self.get_current_player_id()
-            state['is_your_turn'] = state['current_player'] == player_id
-        
+            state['is_your_turn'] = self.get_current_player_id() == player_id
+
+        return state
+
+    def get_player_state(self, player_id: str,
+                         public: Optional[Dict] = None) -> Optional[Dict]:
+        """Get the full game state from a specific player's perspective.
+
+        Used for direct sends (e.g. on reconnection); broadcasts send the
+        public and private halves separately and let the client merge them.
+
+        Args:
+            player_id: The recipient player.
+            public: A prebuilt get_public_state() result to reuse.
+        """
+        private = self.get_private_state(player_id)
+        if private is None:
+            return None
+        if public is None:
+            public = self.get_public_state()
+
+        state = dict(public)
+        state.update(private)
+        # Per-recipient view of the shared player summaries
+        state['players'] = [{**p, 'is_you': p['id'] == player_id}
+                            for p in public['players']]
         return state
 
 
@@ -388,7 +510,8 @@ class GameManager:
     
     def create_room(self) -> str:
         """Create a new game room and return its ID."""
-        room_id = str(uuid.uuid4())[:8]
+        # Same 8-hex-char id as before, without building a UUID object
+        room_id = secrets.token_hex(4)
         self.games[room_id] = WebGame(room_id)
         return room_id
     
@@ -12,9 +12,29 @@ from flask import Flask, render_template, request, session
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from web_game import GameManager
 
+try:
+    import orjson
+
+    class _json:
+        """json-module stand-in backed by orjson.
+
+        Serialization dominates broadcast CPU time, and orjson is several
+        times faster than stdlib json on dict-heavy payloads; Socket.IO
+        expects dumps to return str, so decode the bytes it produces.
+        """
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+except ImportError:
+    import json as _json
+
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", json=_json)
 
 # Game manager instance
 game_manager = GameManager()
@@ -68,10 +88,12 @@ def handle_join_room(data):
     
     if not game.add_player(player_id, player_name):
         if player_id in game.players:
-            # Player reconnecting
+            # Player reconnecting: send the merged full state directly and
+            # forget the cached private payload so the next broadcast resends it
             join_room(room_id)
             join_room(player_id)  # Join personal room for direct messages
             emit('joined', {'room_id': room_id, 'player_id': player_id})
+            _last_private.pop(player_id, None)
             emit('game_state', game.get_player_state(player_id))
             return
         emit('error', {'message': 'Cannot join game (full or already started)'})
@@ -80,7 +102,11 @@ def handle_join_room(data):
     join_room(room_id)
     join_room(player_id)  # Join personal room for direct messages
     emit('joined', {'room_id': room_id, 'player_id': player_id})
-    
+
+    # New joiners missed earlier broadcasts and cannot apply diffs yet,
+    # so send them the full merged state directly
+    emit('game_state', game.get_player_state(player_id))
+
     # Broadcast updated player list to all players in room
     _broadcast_game_state(game)
 
@@ -95,7 +121,13 @@ def handle_leave_room(data):
     if game:
         game.remove_player(player_id)
         leave_room(room_id)
-        _broadcast_game_state(game)
+        _last_private.pop(player_id, None)
+        if not game.players:
+            # Nobody left to broadcast to; retire the room and its caches
+            game_manager.remove_room(room_id)
+            _forget_room(room_id)
+        else:
+            _broadcast_game_state(game)
 
 
 @socketio.on('start_game')
@@ -214,11 +246,102 @@ def handle_disconnect():
     pass
 
 
+# Last private payload sent to each player, to skip redundant emits
+# (socket SIDs are unique across rooms, so one flat dict is enough)
+_last_private = {}
+
+# Rooms with a pending state broadcast, flushed once per tick so bursts
+# of events (e.g. several handlers firing for one play) serialize the
+# state a single time
+_dirty_rooms = set()
+_flush_scheduled = False
+
+
 def _broadcast_game_state(game):
-    """Broadcast game state to all players in a room."""
-    for player_id in game.players:
-        state = game.get_player_state(player_id)
-        socketio.emit('game_state', state, room=player_id)
+    """Mark a room's state dirty and schedule a coalesced broadcast."""
+    global _flush_scheduled
+    _dirty_rooms.add(game.room_id)
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        socketio.start_background_task(_flush_game_states)
+
+
+def _flush_game_states():
+    """Broadcast once per dirty room after yielding to pending handlers."""
+    global _flush_scheduled
+    socketio.sleep(0)
+    _flush_scheduled = False
+    while _dirty_rooms:
+        room_id = _dirty_rooms.pop()
+        game = game_manager.get_game(room_id)
+        if game:
+            _emit_game_state(game)
+            if game.phase == 'game_over':
+                # Finished games broadcast nothing further, so keeping
+                # their snapshots would leak one per room ever played
+                _forget_room(room_id, game.players)
+
+
+def _forget_room(room_id, player_ids=()):
+    """Drop the broadcast caches of a room that ended or emptied."""
+    _last_public.pop(room_id, None)
+    _state_version.pop(room_id, None)
+    _dirty_rooms.discard(room_id)
+    for player_id in player_ids:
+        _last_private.pop(player_id, None)
+
+
+# Per-room snapshot of the last broadcast public state and a version
+# counter, so later broadcasts can send only what changed
+_last_public = {}
+_state_version = {}
+
+
+def _public_snapshot(public):
+    """Copy the mutable parts of a public state for later diffing.
+
+    The game mutates the player summaries, pile view and declarations in
+    place between broadcasts, so the snapshot must not share them.
+    """
+    snap = dict(public)
+    snap['players'] = [dict(p) for p in public['players']]
+    snap['active_player_ids'] = list(public['active_player_ids'])
+    snap['current_pile'] = list(public['current_pile'])
+    snap['declarations'] = dict(public['declarations'])
+    return snap
+
+
+def _emit_game_state(game):
+    """Broadcast game state to all players in a room.
+
+    The first broadcast sends the full public state; afterwards only the
+    top-level keys that changed go out as a versioned 'game_state_diff'
+    that clients merge in. Each player additionally gets a small private
+    payload (hand, turn flags) in their personal room, and only when it
+    actually changed.
+    """
+    room_id = game.room_id
+    public = game.get_public_state()
+    prev = _last_public.get(room_id)
+
+    if prev is None:
+        version = _state_version[room_id] = _state_version.get(room_id, 0) + 1
+        public['state_version'] = version
+        socketio.emit('game_state', public, room=room_id)
+        _last_public[room_id] = _public_snapshot(public)
+    else:
+        diff = {k: v for k, v in public.items() if prev.get(k) != v}
+        if diff:
+            version = _state_version[room_id] = _state_version[room_id] + 1
+            diff['state_version'] = version
+            socketio.emit('game_state_diff', diff, room=room_id)
+            _last_public[room_id] = _public_snapshot(public)
+            _last_public[room_id]['state_version'] = version
+
+    for player_id, private in game.iter_private_states():
+        if _last_private.get(player_id) != private:
+            _last_private[player_id] = private
+            socketio.emit('your_private', private, room=player_id)
 
 
 def run_server(host='0.0.0.0', port=5000, debug=False):